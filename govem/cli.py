@@ -1,10 +1,16 @@
+import functools
+import os
 import re
 import sys
+from itertools import groupby
 from pathlib import Path
 
 import click
 
-from . import download, installation, settings
+from . import database, installation, settings
+
+
+NAME_REGEX = re.compile(r"^[ \w.\-]+\Z")
 
 
 def is_valid_name(ctx, param, value):
@@ -15,7 +21,7 @@ def is_valid_name(ctx, param, value):
     """
     # TODO: We can make this less strict to allow all characters that are
     # valid within directory names.
-    if value is None or re.match(r"^[ \-\_\.\w\d]+$", value):
+    if value is None or NAME_REGEX.match(value):
         return value
     else:
         raise click.BadParameter(
@@ -28,11 +34,12 @@ def exclusive(args: list[str]):
     This method generates a callback to ensure that the given args are not used
     together. The returned method is to be used as a callback for a click option.
     """
+    exclusive_args = frozenset(args)
 
     def check(ctx, param, value):
         if value is not None:
-            for k, v in ctx.params.items():
-                if k in args and v is not None:
+            for k in exclusive_args & ctx.params.keys():
+                if ctx.params[k] is not None:
                     raise click.BadParameter(
                         "The options --local-file, --download-zip and --download-file are mutually exclusive"
                     )
@@ -41,23 +48,36 @@ def exclusive(args: list[str]):
     return check
 
 
+@functools.lru_cache(maxsize=4)
+def _load_versions(path: str, mtime: int) -> tuple[list[dict], dict[str, dict]]:
+    version_list = database.VersionsListData.load_raw(Path(path))
+    return version_list, {i["name"]: i for i in version_list}
+
+
+def load_versions() -> tuple[list[dict], dict[str, dict]]:
+    """
+    Load the cached list of versions as plain dicts together with an index by
+    version name. The parsed data is memoized per file modification time, so
+    repeated lookups within one process are cheap.
+    """
+    versions_file = settings.data.resolve_cachepath(settings.data.versions_file)
+    return _load_versions(str(versions_file), versions_file.stat().st_mtime_ns)
+
+
 def get_version_url(version: str, mono: bool) -> str:
     """
     Get the URL for a given version from the cached data. Shows an
     error message and exits the whole process if version is invalid.
     """
-    versions_file = settings.data.resolve_cachepath(settings.data.versions_file)
-    data = download.VersionsListData.from_json_file(versions_file)
-    try:
-        version_data = next(i for i in data.versions if i.name == version)
-        url = version_data.mono if mono else version_data.default
-    except StopIteration:
+    _, by_name = load_versions()
+    version_data = by_name.get(version)
+    if version_data is None:
         click.secho(f'Could not find "{version}"', fg="red")
         click.echo(
             'Make sure the version database is not outdated. Try running "govem update".'
         )
         sys.exit(1)
-    return url
+    return version_data.get("mono") if mono else version_data["default"]
 
 
 @click.group()
@@ -79,22 +99,27 @@ def versions(unstable, filter):
 
     If FILTER is given, then only versions starting with the filter will be listed.
     """
-    versions_file = settings.data.resolve_cachepath(settings.data.versions_file)
-    data = download.VersionsListData.from_json_file(versions_file)
-    last_major = ""
-    for version in data.versions:
-        # Skip if unstable but user only wants stable versions
-        if version.channel != download.VersionData.CHANNEL_STABLE and not unstable:
+    version_list, _ = load_versions()
+    for major, group in groupby(
+        version_list, key=lambda i: database.get_major(i["name"])
+    ):
+        # Skip the whole major category if no version in it can match the filter
+        if filter and not (major.startswith(filter) or filter.startswith(major)):
             continue
-        # Skip if filter doesn't match
-        if not version.name.startswith(filter):
-            continue
-        # Show version (and major category if it changed)
-        major = version.name[: version.name.find(".")]
-        if last_major != major:
-            last_major = major
-            click.secho(f"\nGodot {major}", fg="blue")
-        click.echo("  " + version.name)
+        show_major = True
+        for version in group:
+            # Skip if unstable but user only wants stable versions
+            channel = version["channel"]
+            if channel != database.VersionData.CHANNEL_STABLE and not unstable:
+                continue
+            # Skip if filter doesn't match
+            if not version["name"].startswith(filter):
+                continue
+            # Show version (and major category before the first one)
+            if show_major:
+                show_major = False
+                click.secho(f"\nGodot {major}", fg="blue")
+            click.echo("  " + version["name"])
 
 
 @cli.command()
@@ -102,6 +127,8 @@ def update():
     """
     Update the internal list of available versions.
     """
+    from . import download
+
     data = download.get_versions(settings.data.mirror)
     versions_file = settings.data.resolve_cachepath(settings.data.versions_file)
     versions_file.parent.mkdir(parents=True, exist_ok=True)
@@ -200,32 +227,36 @@ def list():
     """
     selected_file = settings.data.resolve_datapath(settings.data.selected_file)
     if selected_file.exists():
-        with open(selected_file, "r") as f:
-            selected = f.read()
+        selected = selected_file.read_text()
     else:
         selected = ""
 
+    data_root = settings.data.resolve_datapath("")
+    info_name = settings.data.info_file
+
     click.echo("\nInstalled versions:")
-    for path in settings.data.resolve_datapath("").iterdir():
-        # Skip entries that aren't a version directory
-        if not path.is_dir():
-            continue
-        # Create basic description
-        text = "  ● " if path.name == selected else "  ◯ "
-        text += click.style(path.name, fg="blue")
-        info_file = path / settings.data.info_file
-        # Add source information if it exists
-        if info_file.exists():
-            info = installation.InstallData.from_json_file(info_file)
-            typ = installation.TYPE_DESCRIPTIONS[info.typ]
-            text += f" ({typ})"
-        else:
-            text += click.style(" (no info available)", fg="red")
-        # Add badge if the version is currently selected
-        if path.name == selected:
-            text += click.style(" [selected]", fg="green")
-        # Show the text
-        click.echo(text)
+    with os.scandir(data_root) as entries:
+        for entry in entries:
+            # Skip entries that aren't a version directory
+            if not entry.is_dir():
+                continue
+            # Create basic description
+            is_selected = entry.name == selected
+            text = "  ● " if is_selected else "  ◯ "
+            text += click.style(entry.name, fg="blue")
+            info_file = data_root / entry.name / info_name
+            # Add source information if it exists
+            if info_file.exists():
+                info = installation.InstallData.from_json_file(info_file)
+                typ = installation.TYPE_DESCRIPTIONS[info.typ]
+                text += f" ({typ})"
+            else:
+                text += click.style(" (no info available)", fg="red")
+            # Add badge if the version is currently selected
+            if is_selected:
+                text += click.style(" [selected]", fg="green")
+            # Show the text
+            click.echo(text)
 
 
 @cli.command()
@@ -0,0 +1,48 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from dataclass_wizard import JSONFileWizard
+
+
+@dataclass
+class VersionData:
+    """
+    Specifies the metadata for a version
+    """
+
+    CHANNEL_STABLE: ClassVar[int] = 1
+    CHANNEL_RC: ClassVar[int] = 2
+    CHANNEL_BETA: ClassVar[int] = 3
+    CHANNEL_ALPHA: ClassVar[int] = 4
+
+    name: str
+    channel: int
+    default: str  # URL to default download
+    mono: Optional[str] = None  # optional URL for mono version
+
+
+@dataclass
+class VersionsListData(JSONFileWizard):
+    """
+    Stores the list of versions.
+    Currently it does not store any more information, but it is planned
+    to also store the time of the last update. Inherists from JSONFileWizard
+    for automagic serialisation.
+    """
+
+    versions: list[VersionData] = field(default_factory=list)
+
+    @classmethod
+    def load_raw(cls, path: Path) -> list[dict]:
+        """
+        Loads the versions as plain dicts without constructing any VersionData.
+        This is much cheaper for read-only lookups that only need a few entries.
+        """
+        with open(path, "r") as f:
+            return json.load(f)["versions"]
+
+
+def get_major(name: str) -> str:
+    return name[: name.find(".")]
@@ -1,51 +1,29 @@
-import io
+import functools
 import re
 import shutil
 import zipfile
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import ClassVar, Optional
+from typing import Optional
 from urllib.parse import urljoin
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from dataclass_wizard import JSONFileWizard
+
+from .database import VersionData, VersionsListData
 
 
 VERSION_REGEX = re.compile(r"\d*\.\d*(\.\d)?")
-FLAVOR_REGEX = re.compile(r"\d*")
 
 EXECUTABLE_BITS = 0b001001001
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+SCRAPE_WORKERS = 8
 
-
-@dataclass
-class VersionData:
-    """
-    Specifies the metadata for a version
-    """
-
-    CHANNEL_STABLE: ClassVar[int] = 1
-    CHANNEL_RC: ClassVar[int] = 2
-    CHANNEL_BETA: ClassVar[int] = 3
-    CHANNEL_ALPHA: ClassVar[int] = 4
-
-    name: str
-    channel: int
-    default: str  # URL to default download
-    mono: Optional[str] = None  # optional URL for mono version
-
-
-@dataclass
-class VersionsListData(JSONFileWizard):
-    """
-    Stores the list of versions.
-    Currently it does not store any more information, but it is planned
-    to also store the time of the last update. Inherists from JSONFileWizard
-    for automagic serialisation.
-    """
-
-    versions: list[VersionData] = field(default_factory=list)
+# Shared session so that all requests can reuse pooled keep-alive connections
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 
 class TuxFamilySoup(BeautifulSoup):
@@ -56,30 +34,19 @@ class TuxFamilySoup(BeautifulSoup):
     best options, especially since the structure doesn't seem to change often.
     """
 
-    def __init__(self, url):
-        result = requests.get(url)
+    def __init__(self, url, session: requests.Session = session):
+        result = session.get(url)
         result.raise_for_status()
         self.base_url = url
-        super().__init__(result.text, features="html.parser")
+        super().__init__(result.text, features="lxml")
 
     def get_directories(self, key_filter=lambda x: True) -> dict[str, str]:
         return {
             i.string: urljoin(self.base_url, i["href"])
-            for i in self.find_nested("tr", "td", "a")
+            for i in self.select("tr td a")
             if key_filter(i.string)
         }
 
-    def find_nested(self, *args) -> list[BeautifulSoup]:
-        return self._find_nested([self], *args)
-
-    def _find_nested(self, items: list[BeautifulSoup], *args) -> list[BeautifulSoup]:
-        if not args:
-            return items
-        results = []
-        for i in items:
-            results += self._find_nested(i.find_all(args[0]), *args[1:])
-        return results
-
 
 # BE WARNED!
 # THE FOLLOWING CODE WAS WRITTEN AS A FIRST PROTOTYPE AND NEVER REFACTORED.
@@ -99,47 +66,87 @@ FLAVOR_MAPPING: dict[str, int] = {
     "alpha": VersionData.CHANNEL_ALPHA,
 }
 
+# Filename patterns for the zip files, keyed by version prefix. Lookups try the
+# three character prefix first so that "2.0" takes precedence over "2.".
+FILENAME_FORMATS: dict[str, str] = {
+    "1.": "Godot_v{version}_{flavor}_{typ}x11{join}64.zip",
+    "2.0": "Godot_v{version}_{flavor}_{typ}x11{join}64.zip",
+    "2.": "Godot_v{version}-{flavor}_{typ}x11{join}64.zip",
+    "3.": "Godot_v{version}-{flavor}_{typ}x11{join}64.zip",
+    "4.": "Godot_v{version}-{flavor}_{typ}linux{join}x86_64.zip",
+}
+# Godot 4 alphas up to alpha14 still used the old "64" suffix
+FILENAME_FORMAT_EARLY_ALPHA = "Godot_v{version}-{flavor}_{typ}linux{join}64.zip"
+
 
 def get_executable(src: str, dest_dir: Path, unzip: bool) -> Path:
     # TODO:
-    #  - download in chunks so that we can show a progressbar
     #  - split into two methods for zip and file downloads
     #  - handle mono downloads correctly (probably needs changes to installation too)
     click.echo(f"Downloading from {src}")
-    result = requests.get(src)
-    result.raise_for_status()
+    dest_dir = Path(dest_dir)
+    download_path = dest_dir / ("download.zip" if unzip else "godot")
+    download_file(src, download_path)
 
-    filepath = Path("")
+    filepath = download_path
     if unzip:
         click.echo("Extracting zip file")
-        with zipfile.ZipFile(io.BytesIO(result.content)) as zf:
+        with zipfile.ZipFile(download_path) as zf:
             member = next(i for i in zf.filelist if is_godot_exectuable(i))
-            zf.extract(member, dest_dir)
-            filepath = Path(dest_dir) / Path(member.filename)
-    else:
-        with open(dest_dir / "godot", "wb") as f:
-            f.write(result.content)
+            # Only keep the basename, members must not escape the target dir
+            filepath = dest_dir / Path(member.filename).name
+            with zf.open(member) as src_file, open(filepath, "wb") as dest_file:
+                shutil.copyfileobj(src_file, dest_file, DOWNLOAD_CHUNK_SIZE)
+            filepath.chmod(0o755)
     return filepath
 
 
+def download_file(src: str, dest: Path):
+    """
+    Streams the response body to disk in chunks, so that large downloads
+    never have to be held in memory completely.
+    """
+    with session.get(src, stream=True) as result:
+        result.raise_for_status()
+        length = int(result.headers.get("Content-Length", 0))
+        with open(dest, "wb") as f, click.progressbar(
+            length=length, label="Downloading"
+        ) as bar:
+            for chunk in result.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                bar.update(len(chunk))
+
+
 def get_versions(mirror) -> VersionsListData:
     versions = []
     home = TuxFamilySoup(mirror)
     directories = home.get_directories(is_version)
-    with click.progressbar(
-        directories.items(), label="Updating version database"
-    ) as bar:
-        for version, url in bar:
-            details = TuxFamilySoup(url)
-            directories = details.get_directories()
-            if (data := get_version_data(version, "stable", directories)) is not None:
-                versions.append(data)
-            versions += get_flavor_data_list(version, "alpha", directories)
-            versions += get_flavor_data_list(version, "beta", directories)
-            versions += get_flavor_data_list(version, "rc", directories)
+    # Scraping is bound by network latency, so the version directories are
+    # fetched concurrently. The map keeps the original order of the versions.
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+        results = executor.map(
+            get_version_data_list, directories.keys(), directories.values()
+        )
+        with click.progressbar(
+            results, length=len(directories), label="Updating version database"
+        ) as bar:
+            for data_list in bar:
+                versions += data_list
     return VersionsListData(versions)
 
 
+def get_version_data_list(version: str, url: str) -> list[VersionData]:
+    details = TuxFamilySoup(url)
+    directories = details.get_directories()
+    data_list = []
+    if (data := get_version_data(version, "stable", directories)) is not None:
+        data_list.append(data)
+    data_list += get_flavor_data_list(version, "alpha", directories)
+    data_list += get_flavor_data_list(version, "beta", directories)
+    data_list += get_flavor_data_list(version, "rc", directories)
+    return data_list
+
+
 def get_flavor_data_list(
     version: str, flavor: str, directories: dict[str, str]
 ) -> list[VersionData]:
@@ -167,7 +174,7 @@ def get_version_data(
     if not default_file in directories:
         return None
     name = version if flavor == "stable" else f"{version}-{flavor}"
-    channel = FLAVOR_MAPPING[FLAVOR_REGEX.sub("", flavor)]
+    channel = FLAVOR_MAPPING[flavor.rstrip("0123456789")]
     data = VersionData(name, channel, directories[default_file])
     if "mono" in directories:
         mono_soup = TuxFamilySoup(directories["mono"])
@@ -178,18 +185,20 @@ def get_version_data(
     return data
 
 
-def construct_filename(version: str, flavor: str, mono: bool) -> str:
+@functools.lru_cache(maxsize=None)
+def construct_filename(version: str, flavor: str, mono: bool) -> Optional[str]:
+    fmt = FILENAME_FORMATS.get(version[:3]) or FILENAME_FORMATS.get(version[:2])
+    if fmt is None:
+        return None
+    if (
+        version.startswith("4.")
+        and flavor.startswith("alpha")
+        and int(flavor[5:]) <= 14
+    ):
+        fmt = FILENAME_FORMAT_EARLY_ALPHA
     typ = "mono_" if mono else ""
     join = "_" if mono else "."
-    if version.startswith("1.") or version.startswith("2.0"):
-        return f"Godot_v{version}_{flavor}_{typ}x11{join}64.zip"
-    elif version.startswith("2.") or version.startswith("3."):
-        return f"Godot_v{version}-{flavor}_{typ}x11{join}64.zip"
-    elif version.startswith("4."):
-        if flavor.startswith("alpha") and int(flavor[5:]) <= 14:
-            return f"Godot_v{version}-{flavor}_{typ}linux{join}64.zip"
-        else:
-            return f"Godot_v{version}-{flavor}_{typ}linux{join}x86_64.zip"
+    return fmt.format(version=version, flavor=flavor, typ=typ, join=join)
 
 
 def is_version(text: str) -> bool:
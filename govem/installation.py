@@ -1,3 +1,4 @@
+import os
 import shutil
 import subprocess
 from dataclasses import dataclass
@@ -8,7 +9,7 @@ from typing import Optional
 import click
 from dataclass_wizard import JSONFileWizard
 
-from . import download, settings
+from . import settings
 
 
 TYPE_DOWNLOAD_AUTO = 0
@@ -65,6 +66,8 @@ def install_download(name: str, url: str, unzip: bool, force: bool = False):
     """
     Downloads the executable, then proceed with a normal file-based installation
     """
+    from . import download
+
     install_dir = settings.data.resolve_datapath(name)
     if install_dir.exists() and not force:
         raise InstallationExistsError(
@@ -73,10 +76,17 @@ def install_download(name: str, url: str, unzip: bool, force: bool = False):
     with TemporaryDirectory(prefix="govem_") as tmp:
         filepath = download.get_executable(url, tmp, unzip)
         data = InstallData(TYPE_DOWNLOAD_AUTO, url, unzip)
-        install_file(name, data, filepath, force)
+        # The downloaded file is owned by govem, so it can be linked
+        install_file(name, data, filepath, force, link=True)
 
 
-def install_file(name: str, data: InstallData, src_file: Path, force: bool = False):
+def install_file(
+    name: str,
+    data: InstallData,
+    src_file: Path,
+    force: bool = False,
+    link: bool = False,
+):
     """
     Installs a file by copying it to the installation directory and creating
     all the other fancy stuff:
@@ -85,6 +95,10 @@ def install_file(name: str, data: InstallData, src_file: Path, force: bool = Fal
     - symlink binary
     - icon
     - desktop file
+
+    If link is set, the file is hardlinked instead of copied when possible. This
+    must only be used for files owned by govem (like downloads), as the link
+    shares permissions and contents with the source file.
     """
     install_dir = settings.data.resolve_datapath(name)
     if install_dir.exists() and not force:
@@ -95,7 +109,10 @@ def install_file(name: str, data: InstallData, src_file: Path, force: bool = Fal
     click.echo("Copying executable file to installation directory")
     install_dir.mkdir(parents=True, exist_ok=True)
     target_file = install_dir / settings.data.executable_file
-    shutil.copy(src_file, target_file)
+    if link:
+        link_or_copy(src_file, target_file)
+    else:
+        shutil.copy(src_file, target_file)
     target_file.chmod(0o755)
 
     click.echo("Writing metadata to installation directory")
@@ -120,6 +137,26 @@ def install_file(name: str, data: InstallData, src_file: Path, force: bool = Fal
     create_desktopfile(name, install_dir, settings.data.desktopfile_install)
 
 
+def link_or_copy(src_file: Path, target_file: Path):
+    """
+    Hardlinks a file to the target location, which avoids copying large
+    executables. Falls back to a regular copy when linking is not possible
+    (for example when source and target are on different filesystems).
+    The link is created under a temporary name and then moved over the target,
+    so a failed link never removes an existing file.
+    """
+    if target_file.exists() and os.path.samefile(src_file, target_file):
+        raise shutil.SameFileError(f"{src_file} and {target_file} are the same file")
+    tmp_file = target_file.with_name(target_file.name + ".tmp")
+    tmp_file.unlink(missing_ok=True)
+    try:
+        os.link(src_file, tmp_file)
+    except OSError:
+        shutil.copy(src_file, target_file)
+        return
+    os.replace(tmp_file, target_file)
+
+
 def uninstall(name: str):
     """
     Uninstalls a given version by deleting all associated files
@@ -138,8 +175,7 @@ def uninstall(name: str):
 
     selected_file = settings.data.resolve_datapath(settings.data.selected_file)
     if selected_file.exists():
-        with open(selected_file, "r") as f:
-            selected = f.read()
+        selected = selected_file.read_text()
     else:
         selected = ""
     if selected == name:
@@ -189,18 +225,17 @@ def create_desktopfile(name: str, workdir: Path, install: bool):
         f.write(content)
     path.chmod(0o644)
     if install:
-        target = Path.home() / ".local/share/applications"
-        subprocess.run(["desktop-file-install", f"--dir={target}", path])
-        subprocess.run(["update-desktop-database", target])
-        subprocess.run(["xdg-desktop-menu", "forceupdate"])
+        # Installs the file for the current user and refreshes the menu database
+        subprocess.run(
+            ["xdg-desktop-menu", "install", "--mode", "user", "--novendor", path]
+        )
 
 
 def remove_desktopfile(name: str):
     """
     Removes a desktopfile and updates the systems menu database
     """
-    target = (
-        Path.home() / ".local/share/applications" / DESKTOPFILE_NAME.format(name=name)
+    filename = DESKTOPFILE_NAME.format(name=name)
+    subprocess.run(
+        ["xdg-desktop-menu", "uninstall", "--mode", "user", "--novendor", filename]
     )
-    target.unlink(missing_ok=True)
-    subprocess.run(["xdg-desktop-menu", "forceupdate"])
@@ -18,33 +18,34 @@ from pathlib import Path
 @dataclass
 class SettingsData:
     mirror: str
-    cache_path: str  # Dir to store cached data (like version list)
-    data_path: str  # Dir to store installations
-    bin_path: str  # Dir to symlink binaries in (should be a location in PATH)
+    cache_path: Path  # Dir to store cached data (like version list)
+    data_path: Path  # Dir to store installations
+    bin_path: Path  # Dir to symlink binaries in (should be a location in PATH)
     desktopfile_install: bool = True
     versions_file: str = "versions.json"
     executable_file: str = "godot"
     info_file: str = "info.json"
     selected_file: str = "selected.txt"
 
-    # TODO: Instead of having resolve methods, we can directly resolve
-    # the base path when loading the settings.
+    # The base paths are already resolved when loading the settings, so these
+    # are plain path joins without any filesystem access.
     def resolve_cachepath(self, name: str) -> Path:
-        return (Path.cwd() / Path(self.cache_path)).resolve() / Path(name)
+        return self.cache_path / name
 
     def resolve_datapath(self, name: str) -> Path:
-        return (Path.cwd() / Path(self.data_path)).resolve() / Path(name)
+        return self.data_path / name
 
     def resolve_binpath(self, name: str) -> Path:
-        return (Path.cwd() / Path(self.bin_path)).resolve() / Path(name)
+        return self.bin_path / name
 
 
 def load_settings() -> SettingsData:
+    base = Path.cwd()
     return SettingsData(
         "https://downloads.tuxfamily.org/godotengine/",
-        ".cache",
-        ".data",
-        ".shims",
+        (base / ".cache").resolve(),
+        (base / ".data").resolve(),
+        (base / ".shims").resolve(),
         True,
     )
 